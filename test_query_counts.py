@@ -0,0 +1,60 @@
+# Query-count regression tests: fail when an endpoint starts running more SQL than expected (e.g. an N+1 lazy load).
+# Runs against a temporary SQLite database, selected through DATABASE_URI before main is imported.
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import event
+
+DB_DIR = tempfile.mkdtemp()
+os.environ['DATABASE_URI'] = f"sqlite:///{os.path.join(DB_DIR, 'test.db')}"
+os.environ.pop('READ_DATABASE_URI', None)
+
+import main
+
+
+@pytest.fixture(scope='module')
+def client():
+    client = main.app.test_client()
+    # Enough rows that a per-row lazy load would show up as extra queries
+    for u in range(3):
+        client.post('/users', json={'name': f'user{u}', 'email': f'user{u}@example.com', 'address': 'addr'})
+    for p in range(5):
+        client.post('/products', json={'product_name': f'product{p}', 'price': p + 0.5})
+    for u in range(1, 4):
+        for _ in range(3):
+            client.post('/orders', json={'order_date': '2024-01-01', 'user_id': u})
+    for o in range(1, 10):
+        for p in range(1, 6):
+            client.put(f'/orders/{o}/add_product/{p}')
+    return client
+
+
+# Count statements on every engine, including the read engine that GET routes use
+@pytest.fixture
+def query_counter():
+    counts = {'queries': 0}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counts['queries'] += 1
+
+    with main.app.app_context():
+        engines = list(main.db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', count)
+    yield counts
+    for engine in engines:
+        event.remove(engine, 'before_cursor_execute', count)
+
+
+@pytest.mark.parametrize('url, max_queries', [
+    ('/users', 1),
+    ('/products', 1),
+    ('/orders/user/1', 2), # user lookup + orders
+    ('/orders/1/products', 2), # order + selectinload of its products
+])
+def test_list_endpoint_query_count(client, query_counter, url, max_queries):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert len(response.get_json()) > 1
+    assert 1 <= query_counter['queries'] <= max_queries # At least one, so a counter that sees nothing can't pass